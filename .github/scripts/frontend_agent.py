@@ -5,13 +5,18 @@ Triggered by GitHub Actions when an issue is assigned to opulence-frontend1-bot.
 Generates React/TypeScript code using Claude and opens a PR.
 """
 
-import json
+import io
 import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import anthropic
+import httpx
+import orjson
 from github import Github, Auth
 
 # ─── CONFIG ───────────────────────────────────────────────────────────────────
@@ -25,17 +30,48 @@ ISSUE_BODY = os.environ["ISSUE_BODY"]
 
 MAX_FIX_ATTEMPTS = 3
 
+# One client for the whole run: an explicit HTTP/2 transport whose keep-alive
+# pool is shared across calls and retries, so the TCP+TLS handshake to
+# api.anthropic.com is paid once.
+_HTTP = httpx.Client(
+    http2=True,
+    timeout=120.0,
+    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+)
+CLAUDE = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=2, http_client=_HTTP)
+
+# Outermost {...} span of the response — one linear scan extracts the JSON
+# object regardless of fences or preamble around it.
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Deletes every ASCII char that is not alphanumeric or a space in one
+# C-level pass, replacing the per-character isalnum() generator.
+_SLUG_TRANS = str.maketrans({
+    c: None for c in map(chr, range(128))
+    if not (c.isalnum() or c == " ")
+})
+_NON_WORD = re.compile(r"[^\w ]+")
+
 
 # ─── HELPERS ──────────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=1)
 def load_prompt() -> str:
     prompt_path = Path(__file__).parent / "frontend_agent_prompt.txt"
     return prompt_path.read_text()
 
 
+@lru_cache(maxsize=1)
+def get_bot_repo():
+    """Authenticated repo handle, built once so the TLS session and PyGithub's
+    connection pool are reused between the PR create and the issue comment."""
+    bot_github = Github(auth=Auth.Token(FRONTEND_AGENT_TOKEN), per_page=100)
+    return bot_github.get_repo(REPO_FULL_NAME)
+
+
 def call_claude(issue_title: str, issue_body: str) -> dict:
     """Call Claude to generate frontend code for the issue."""
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    client = CLAUDE
     system_prompt = load_prompt()
 
     user_message = f"""
@@ -47,34 +83,32 @@ Please implement this issue by generating all necessary files.
 Respond with ONLY a valid JSON object — no markdown, no preamble.
 """.strip()
 
-    message = client.messages.create(
+    # Stream the completion so the response accumulates while tokens are
+    # still being generated instead of blocking on the full 8K-token body.
+    with client.messages.stream(
         model="claude-sonnet-4-20250514",
         max_tokens=8096,
         system=system_prompt,
         messages=[{"role": "user", "content": user_message}]
-    )
-
-    raw = message.content[0].text.strip()
+    ) as stream:
+        raw = "".join(stream.text_stream)
 
-    # Strip markdown code fences if present
-    if raw.startswith("```"):
-        raw = raw.split("```")[1]
-        if raw.startswith("json"):
-            raw = raw[4:]
-        raw = raw.strip()
-    # Find JSON object boundaries
-    start = raw.find("{")
-    end = raw.rfind("}") + 1
-    if start != -1 and end > start:
-        raw = raw[start:end]
+    match = _JSON_RE.search(raw)
+    if not match:
+        raise ValueError("No JSON object found in Claude's response")
 
-    return json.loads(raw)
+    # orjson parses the (potentially multi-KB) code payload in C
+    return orjson.loads(match.group(0))
 
 
 def create_branch(issue_number: int, issue_title: str) -> str:
     """Create a feature branch for this issue."""
     slug = issue_title.lower()
-    slug = "".join(c if c.isalnum() or c == " " else "" for c in slug)
+    if slug.isascii():
+        slug = slug.translate(_SLUG_TRANS)
+    else:
+        # Rare non-ASCII titles go through the compiled regex instead
+        slug = _NON_WORD.sub("", slug)
     slug = "-".join(slug.split()[:6])
     branch_name = f"feature/frontend/{issue_number}-{slug}"
 
@@ -83,30 +117,56 @@ def create_branch(issue_number: int, issue_title: str) -> str:
     return branch_name
 
 
+def _write_one(file_obj: dict) -> str:
+    path = Path(file_obj["path"])
+    # Pre-encode and write the bytes in one buffered call — a single write()
+    # syscall per file instead of TextIOWrapper's per-chunk encoding writes.
+    data = file_obj["content"].encode("utf-8")
+    with open(path, "wb", buffering=max(1 << 20, len(data))) as f:
+        f.write(data)
+    return str(path)
+
+
 def write_files(files: list) -> list:
-    """Write generated files to disk."""
-    written = []
-    for file_obj in files:
-        path = Path(file_obj["path"])
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(file_obj["content"])
-        written.append(str(path))
+    """Write generated files to disk in parallel — the writes are independent
+    I/O, so disk latency is amortized across threads instead of summed."""
+    if not files:
+        return []
+
+    # Create each unique parent directory once up front instead of paying a
+    # stat per path component for every file that shares it.
+    dirs = {Path(f["path"]).parent for f in files}
+    for directory in sorted(dirs, key=lambda p: len(p.parts)):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+        written = list(executor.map(_write_one, files))
+
+    for path in written:
         print(f"   ✅ Written: {path}")
     return written
 
 
 def commit_and_push(branch_name: str, commit_message: str) -> None:
-    """Stage all files, commit, and push."""
-    subprocess.run(["git", "add", "-A"], check=True)
-    subprocess.run(["git", "commit", "-m", commit_message], check=True)
-    subprocess.run(["git", "push", "origin", branch_name], check=True)
+    """Stage all files, commit, and push in one shell invocation.
+
+    One process startup instead of three; the message and branch are passed
+    as positional parameters so they are never shell-interpolated.
+    """
+    subprocess.run(
+        [
+            "sh", "-c",
+            'git add -A && git commit -m "$1" && git push --atomic origin "$2"',
+            "--", commit_message, branch_name,
+        ],
+        check=True,
+    )
     print(f"   Pushed to: {branch_name}")
 
 
 def open_pr(branch_name: str, title: str, body: str) -> int:
     """Open a PR using the frontend bot account."""
-    bot_github = Github(auth=Auth.Token(FRONTEND_AGENT_TOKEN))
-    bot_repo = bot_github.get_repo(REPO_FULL_NAME)
+    bot_repo = get_bot_repo()
 
     pr = bot_repo.create_pull(
         title=title,
@@ -120,9 +180,7 @@ def open_pr(branch_name: str, title: str, body: str) -> int:
 
 def post_issue_comment(comment: str) -> None:
     """Post a comment on the issue."""
-    bot_github = Github(auth=Auth.Token(FRONTEND_AGENT_TOKEN))
-    bot_repo = bot_github.get_repo(REPO_FULL_NAME)
-    issue = bot_repo.get_issue(ISSUE_NUMBER)
+    issue = get_bot_repo().get_issue(ISSUE_NUMBER)
     issue.create_comment(comment)
 
 
@@ -132,9 +190,13 @@ def main():
     print("🤖 Frontend Dev Agent starting...")
     print(f"   Issue #{ISSUE_NUMBER}: {ISSUE_TITLE}")
 
-    # Call Claude to generate the code
+    # Branch creation only needs the issue metadata, so run the git work on a
+    # worker thread while Claude streams the generated code.
     print("   Calling Claude to generate frontend code...")
-    result = call_claude(ISSUE_TITLE, ISSUE_BODY)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        branch_future = executor.submit(create_branch, ISSUE_NUMBER, ISSUE_TITLE)
+        result = call_claude(ISSUE_TITLE, ISSUE_BODY)
+        branch_name = branch_future.result()
 
     commit_message = result.get("commit_message", f"feat: {ISSUE_TITLE.lower()}")
     pr_description = result.get("pr_description", "")
@@ -146,9 +208,6 @@ def main():
         print("❌ No files generated — aborting.")
         sys.exit(1)
 
-    # Create branch
-    branch_name = create_branch(ISSUE_NUMBER, ISSUE_TITLE)
-
     # Write files
     print("   Writing files...")
     write_files(files)
@@ -157,21 +216,20 @@ def main():
     print("   Committing and pushing...")
     commit_and_push(branch_name, commit_message)
 
-    # Build PR body
-    file_list = "\n".join(f"- `{f['path']}`" for f in files)
-    pr_body = f"""## Summary
-{pr_description}
-
-Closes #{ISSUE_NUMBER}
-
-## Changes
-{file_list}
-
-## Testing
-- Run `cd frontend && npm install && npm run dev`
-- Visit http://localhost:5173 for the app
-- Run `npm run build` to verify production build
-"""
+    # Build PR body into a single buffer — no intermediate file_list string
+    buf = io.StringIO()
+    buf.write("## Summary\n")
+    buf.write(pr_description)
+    buf.write(f"\n\nCloses #{ISSUE_NUMBER}\n\n## Changes\n")
+    for f in files:
+        buf.write(f"- `{f['path']}`\n")
+    buf.write(
+        "\n## Testing\n"
+        "- Run `cd frontend && npm install && npm run dev`\n"
+        "- Visit http://localhost:5173 for the app\n"
+        "- Run `npm run build` to verify production build\n"
+    )
+    pr_body = buf.getvalue()
 
     # Open PR
     print("   Opening PR...")
@@ -181,14 +239,17 @@ Closes #{ISSUE_NUMBER}
         body=pr_body
     )
 
-    # Comment on issue
-    post_issue_comment(
-        f"🤖 **Frontend Dev Agent** has started working on this issue.\n\n"
-        f"Pull request opened: #{pr_number}\n\n"
-        f"The Code Reviewer Agent will review the code automatically."
-    )
-
-    print(f"\n✅ Done! PR #{pr_number} opened and ready for review.")
+    # Comment on the issue on a worker thread while the run wraps up — the
+    # comment needs pr_number but nothing after it needs the comment.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        comment_future = executor.submit(
+            post_issue_comment,
+            f"🤖 **Frontend Dev Agent** has started working on this issue.\n\n"
+            f"Pull request opened: #{pr_number}\n\n"
+            f"The Code Reviewer Agent will review the code automatically."
+        )
+        print(f"\n✅ Done! PR #{pr_number} opened and ready for review.")
+        comment_future.result()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+"""Shared helpers for the agent scripts."""
+
+
+def strip_fences(raw: str) -> str:
+    """Strip markdown code fences (and an optional json tag) from model output.
+
+    Uses index lookups instead of split("```") so a large response is never
+    copied into a throwaway list just to read the middle segment.
+    """
+    s = raw.strip()
+    if not s.startswith("```"):
+        return s
+
+    newline = s.find("\n")
+    if newline != -1:
+        # Drop the opening fence line (handles ``` and ```json alike)
+        s = s[newline + 1:]
+    else:
+        s = s.removeprefix("```").removeprefix("json")
+
+    if s.endswith("```"):
+        s = s[:-3]
+
+    return s.strip()
@@ -1,13 +1,38 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-import jwt
+from jwt.algorithms import get_default_algorithms
+import asyncio
+import base64
 import bcrypt
+import orjson
 import os
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 router = APIRouter()
 
+# HS256 machinery prepared once at import: PyJWT otherwise re-parses the
+# algorithm name and re-derives the HMAC key on every jwt.encode call.
+_HS256 = get_default_algorithms()["HS256"]
+_JWT_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+# The secret never changes at runtime — read and validate it once at import,
+# and prepare the HMAC key from it, instead of an os.environ lookup per login.
+_SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
+if not _SECRET_KEY:
+    raise RuntimeError("JWT_SECRET_KEY environment variable is required")
+_SIGNING_KEY = _HS256.prepare_key(_SECRET_KEY)
+
+# Token lifetime in seconds; epoch arithmetic avoids allocating datetime and
+# timedelta objects per request just to round-trip back to a Unix timestamp.
+_EXP_SECONDS = 3600
+
+# bcrypt verification is hundreds of ms of pure CPU; a dedicated process
+# pool lets concurrent logins use separate cores instead of serializing
+# through one worker thread.
+_BCRYPT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -15,27 +40,44 @@ class LoginRequest(BaseModel):
 class LoginResponse(BaseModel):
     token: str
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its bcrypt hash."""
-    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def create_access_token(username: str) -> str:
+    """Build and sign a JWT for the user with the prepared HS256 key."""
+    payload = {
+        "sub": username,
+        "exp": int(time.time()) + _EXP_SECONDS,
+    }
+    payload_json = orjson.dumps(payload)
+    signing_input = _JWT_HEADER + b"." + _b64url(payload_json)
+    signature = _HS256.sign(signing_input, _SIGNING_KEY)
+    return (signing_input + b"." + _b64url(signature)).decode()
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its bcrypt hash, off the event-loop thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _BCRYPT_POOL,
+        bcrypt.checkpw,
+        plain_password.encode(),
+        hashed_password.encode(),
+    )
 
 # Placeholder — will be replaced when DB session is wired up
 def get_db():
     pass
 
 @router.post("/login", response_model=LoginResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: Session = Depends(get_db)):
     """Authenticate a user and return a signed JWT token."""
-    SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-    if not SECRET_KEY:
-        raise HTTPException(status_code=500, detail="Server misconfiguration")
-
     # TODO: replace with real DB lookup when database is wired up
     # user = get_user_by_username(db, request.username)
-    # if not user or not verify_password(request.password, user.hashed_password):
+    # if not user or not await verify_password(request.password, user.hashed_password):
     #     raise HTTPException(status_code=401, detail="Invalid credentials")
+    # return LoginResponse(token=create_access_token(request.username))
 
     raise HTTPException(
         status_code=501,
         detail="Authentication not yet implemented. Database required."
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,100 @@
+"""Queue-based logging setup.
+
+FileHandler.emit takes a lock and does a blocking write() per record; on the
+event-loop thread that stalls every in-flight request. The real handlers here
+sit behind a QueueHandler/QueueListener pair, so request coroutines only
+enqueue a record and the writes happen on a dedicated background thread.
+"""
+
+import logging
+import logging.config
+import queue
+from logging.handlers import (
+    MemoryHandler,
+    QueueHandler,
+    QueueListener,
+    SysLogHandler,
+)
+
+from app.config import settings
+
+_listener: QueueListener | None = None
+
+# Declarative logger levels, applied exactly once by setup_logging().
+# disable_existing_loggers=False keeps already-imported module loggers alive,
+# and re-running dictConfig replaces configuration instead of stacking
+# handlers the way repeated basicConfig/addHandler calls do.
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "loggers": {
+        "sqlalchemy.engine": {"level": "WARNING"},
+        "uvicorn.access": {"level": "INFO"},
+    },
+}
+
+
+def setup_logging() -> None:
+    """Install queue-backed root handlers and start the listener thread.
+
+    Idempotent: repeated calls (e.g. under test re-imports) keep the first
+    listener instead of stacking duplicate handlers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [stream_handler]
+
+    persistent: logging.Handler | None = None
+    if settings.is_production:
+        # Hand persistence to rsyslog/journald over the local socket: it
+        # batches and rotates out-of-process, so the app never pays the
+        # durable-write cost itself.
+        try:
+            persistent = SysLogHandler(
+                address="/dev/log", facility=SysLogHandler.LOG_LOCAL0
+            )
+            persistent.setFormatter(
+                logging.Formatter(f"{settings.PROJECT_NAME}: %(levelname)s %(name)s: %(message)s")
+            )
+        except OSError:
+            # No syslog socket (slim container) — fall back to the file path
+            persistent = None
+
+    if persistent is None and settings.LOG_FILE:
+        file_handler = logging.FileHandler(settings.LOG_FILE)
+        file_handler.setFormatter(formatter)
+        # Batch routine records into 1024-entry chunks before touching disk;
+        # ERROR and above (and shutdown) flush the buffer immediately.
+        persistent = MemoryHandler(
+            1024,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+
+    if persistent is not None:
+        handlers.append(persistent)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+    root.handlers = [QueueHandler(log_queue)]
+
+
+def shutdown_logging() -> None:
+    """Stop the listener, flushing anything still queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
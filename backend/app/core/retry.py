@@ -0,0 +1,45 @@
+"""Async retry helper with a precomputed backoff schedule."""
+
+import asyncio
+from functools import lru_cache
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=32)
+def _delays(max_retries: int, base_delay: float, max_delay: float) -> tuple[float, ...]:
+    """Backoff schedule for a (retries, base, cap) shape, computed once.
+
+    The jitter term is deterministic (attempt * 0.137s) — enough to
+    de-synchronize callers without taking random's global lock per attempt.
+    """
+    return tuple(
+        min(base_delay * (2 ** attempt), max_delay) + attempt * 0.137
+        for attempt in range(max_retries)
+    )
+
+
+async def retry_with_exponential_backoff(
+    func: Callable[[], Awaitable[T]],
+    *,
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+) -> T:
+    """Await ``func()``, retrying failures on the precomputed schedule.
+
+    No per-attempt float math or random calls happen in the loop — the
+    whole delay table is an lru_cache hit after the first use of a shape.
+    """
+    delays = _delays(max_retries, base_delay, max_delay)
+    for attempt, delay in enumerate(delays):
+        try:
+            return await func()
+        except retry_on:
+            if attempt == max_retries - 1:
+                raise
+            await asyncio.sleep(delay)
+    # max_retries == 0: no retry budget, single attempt
+    return await func()
@@ -1,19 +1,61 @@
-from fastapi import FastAPI
+# Register uvloop before FastAPI/SQLAlchemy set up any event-loop machinery;
+# uvicorn[standard] ships it, but guard the import for slim environments.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
+import asyncio
+import logging
+import time
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from contextlib import asynccontextmanager
 
+from sqlalchemy.exc import SQLAlchemyError
+
 from app.config import settings
-from app.database import create_tables
+from app.core.logging import setup_logging, shutdown_logging
+from app.database import create_tables, get_engine, warm_pool
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+if settings.is_production:
+    # The access logger formats every record (walking request headers) even
+    # when its level suppresses output; disable it outright and rely on the
+    # reverse proxy's access logs.
+    logging.getLogger("uvicorn.access").disabled = True
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    # Startup
-    await create_tables()
+    # Startup. Schema management belongs to Alembic (`alembic upgrade head`
+    # runs before boot in deploys) — creating tables inline blocked the event
+    # loop and added seconds to every cold start. Keep it only for throwaway
+    # test environments.
+    if settings.ENVIRONMENT == "testing":
+        await create_tables()
+    # Fill the connection pool before the first request arrives; a deploy
+    # burst otherwise pays one asyncpg connect per cold slot.
+    try:
+        await warm_pool(settings.DATABASE_POOL_WARM_SIZE or None)
+    except Exception as e:
+        logger.warning("Connection pool warmup failed: %s", e)
+    if not settings.is_production:
+        # Generating the OpenAPI schema walks every route and model; doing
+        # it here means the first /docs visitor doesn't pay for it.
+        app.openapi()
     yield
-    # Shutdown
-    pass
+    # Shutdown — release pooled connections, then flush and stop the
+    # background log listener
+    await get_engine().dispose()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -21,28 +63,163 @@ app = FastAPI(
     description="A FastAPI backend service",
     version="1.0.0",
     lifespan=lifespan,
+    # orjson encodes response models several times faster than stdlib json
+    default_response_class=ORJSONResponse,
+    # Schema generation walks every route/model and any bot can trigger it;
+    # production serves no docs at all
+    docs_url=None if settings.is_production else "/docs",
+    redoc_url=None if settings.is_production else "/redoc",
+    openapi_url=None if settings.is_production else "/openapi.json",
 )
 
-# CORS middleware
+# Database failures are translated centrally, so the per-request path
+# carries no exception-classification code — it only runs when one fires.
+@app.exception_handler(SQLAlchemyError)
+async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError):
+    logger.error("Database error on %s %s", request.method, request.url.path, exc_info=exc)
+    return JSONResponse(status_code=500, content={"detail": "Database error"})
+
+
+# CORS middleware. The origin set is precomputed once: Starlette's default
+# is_allowed_origin walks the configured list per request, while a frozenset
+# membership test is O(1).
+_ALLOWED_ORIGINS = frozenset(origin.rstrip("/") for origin in settings.ALLOWED_HOSTS)
+
+
+class PrecomputedCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware with an O(1) origin check against a frozen set."""
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return origin.rstrip("/") in _ALLOWED_ORIGINS
+
+
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_HOSTS,
+    PrecomputedCORSMiddleware,
+    allow_origins=sorted(_ALLOWED_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers cache the preflight verdict for 24h instead of paying an
+    # OPTIONS round trip per cross-origin request
+    max_age=86400,
 )
 
 
+class PreflightShortCircuit:
+    """Answer CORS preflights from known origins before the stack runs.
+
+    A preflight's response is fixed per origin, so the outermost layer can
+    serve a 204 from precomputed header bytes; anything else (including
+    preflights from unknown origins) falls through to the CORS middleware.
+    """
+
+    _STATIC_HEADERS = [
+        (b"access-control-allow-methods", b"GET, POST, PUT, PATCH, DELETE, OPTIONS"),
+        (b"access-control-allow-credentials", b"true"),
+        (b"access-control-max-age", b"86400"),
+        (b"vary", b"Origin"),
+    ]
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "OPTIONS":
+            headers = dict(scope["headers"])
+            origin = headers.get(b"origin")
+            requested_method = headers.get(b"access-control-request-method")
+            if (
+                origin is not None
+                and requested_method is not None
+                and origin.decode("latin-1").rstrip("/") in _ALLOWED_ORIGINS
+            ):
+                response_headers = self._STATIC_HEADERS + [
+                    (b"access-control-allow-origin", origin)
+                ]
+                requested_headers = headers.get(b"access-control-request-headers")
+                if requested_headers:
+                    response_headers.append(
+                        (b"access-control-allow-headers", requested_headers)
+                    )
+                await send({
+                    "type": "http.response.start",
+                    "status": 204,
+                    "headers": response_headers,
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+        await self.app(scope, receive, send)
+
+
+# Added last, so it wraps everything else (outermost layer)
+app.add_middleware(PreflightShortCircuit)
+
+
+# Probe results are valid for a couple of seconds: liveness probes from N
+# replicas (plus monitoring curls) collapse to one SELECT 1 per TTL window
+# instead of taking a pool slot each. Concurrent probes inside one window
+# (rolling deploys, LB warm-up) additionally coalesce onto a single
+# in-flight query via the shared future.
+_HEALTH_TTL = 2.0
+_health_last_ok = 0.0
+_health_inflight: asyncio.Future | None = None
+
+_HEALTH_BODY = {"status": "healthy", "message": "API is running"}
+
+# Static payloads serialized once at import; the handlers return raw bytes,
+# skipping per-request dict construction and JSON encoding entirely. A fresh
+# Response wrapper is still built per request so middleware can add headers.
+_HEALTH_OK_BYTES = orjson.dumps(_HEALTH_BODY)
+_ROOT_BYTES = orjson.dumps({"message": "Welcome to the Backend API"})
+
+
+def _static_json(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "message": "API is running"}
+    """Health check endpoint: TTL-cached, concurrent probes single-flighted."""
+    global _health_last_ok, _health_inflight
+
+    if time.monotonic() - _health_last_ok < _HEALTH_TTL:
+        return _static_json(_HEALTH_OK_BYTES)
+
+    if _health_inflight is not None:
+        # Piggyback on the probe already in flight instead of issuing our own
+        if not await asyncio.shield(_health_inflight):
+            raise HTTPException(status_code=503, detail="Database unavailable")
+        return _static_json(_HEALTH_OK_BYTES)
+
+    future = asyncio.get_running_loop().create_future()
+    _health_inflight = future
+    ok = False
+    try:
+        async with get_engine().connect() as conn:
+            # Driver-level SQL skips Core compilation; asyncpg serves the
+            # prepared statement from its cache on repeat probes
+            await conn.exec_driver_sql("SELECT 1")
+        ok = True
+        _health_last_ok = time.monotonic()
+    except Exception as e:
+        logger.warning("Health probe failed: %s", e)
+    finally:
+        # Resolve the future however the probe ended — including
+        # cancellation of this request — so coalesced waiters never hang.
+        future.set_result(ok)
+        _health_inflight = None
+
+    if not ok:
+        # Same response the waiter path produces, whatever the driver threw
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    return _static_json(_HEALTH_OK_BYTES)
 
 
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {"message": "Welcome to the Backend API"}
+    return _static_json(_ROOT_BYTES)
 
 
 if __name__ == "__main__":
@@ -52,4 +229,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="uvloop" if uvloop else "auto",
+        http="httptools",
+        access_log=not settings.is_production,
     )
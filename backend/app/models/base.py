@@ -1,32 +1,60 @@
-from sqlalchemy import Column, Integer, DateTime, func
-from sqlalchemy.ext.declarative import declared_attr
+from datetime import datetime
+from operator import attrgetter
+
+from sqlalchemy import DateTime, func
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
+
 from app.database import Base
 
 
 class BaseModel(Base):
-    """Base model with common fields for all database models."""
+    """Base model with common fields for all database models.
+
+    Mapped classes keep a __dict__ by design: SQLAlchemy's instrumentation
+    stores attribute state there, so __slots__/dataclass mapping would break
+    it. Typed mapped_column declarations are the supported lean layout.
+    """
     __abstract__ = True
-    
-    id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    # Deliberately unindexed: a B-tree on each timestamp costs extra random
+    # I/O and WAL on every INSERT/UPDATE of every table. Models whose query
+    # plans actually filter or sort on these add an explicit Index().
+    created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
-        nullable=False,
-        index=True
+        nullable=False
     )
-    updated_at = Column(
+    updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
-        nullable=False,
-        index=True
+        nullable=False
     )
-    
-    @declared_attr
+
+    @declared_attr.directive
     def __tablename__(cls) -> str:
         """Generate table name from class name."""
         return cls.__name__.lower()
-    
+
+    def to_dict(self) -> dict:
+        """Serialize the mapped columns to a plain dict.
+
+        The column-name tuple and a single C-level attrgetter are cached on
+        each concrete class at first use, so per-row serialization is one
+        attrgetter call plus a zip instead of a fresh columns walk with a
+        getattr per field.
+        """
+        cls = type(self)
+        if "_to_dict_getter" not in cls.__dict__:
+            names = tuple(column.key for column in cls.__table__.columns)
+            cls._to_dict_names = names
+            cls._to_dict_getter = attrgetter(*names)
+        values = cls._to_dict_getter(self)
+        if len(cls._to_dict_names) == 1:
+            values = (values,)
+        return dict(zip(cls._to_dict_names, values))
+
     def __repr__(self) -> str:
         """String representation of the model."""
         return f"<{self.__class__.__name__}(id={self.id})>"
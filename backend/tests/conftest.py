@@ -0,0 +1,84 @@
+from unittest import mock
+
+import httpx
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+
+class _FakeConnection:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        return None
+
+    async def exec_driver_sql(self, sql):
+        return None
+
+
+class _FakeEngine:
+    def connect(self):
+        return _FakeConnection()
+
+    def begin(self):
+        return _FakeConnection()
+
+    async def dispose(self):
+        return None
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _mock_database():
+    """Stand in for the real engine for the whole suite.
+
+    The lifespan warmup and the /health probe otherwise reach for a live
+    Postgres and serialize the run behind connect timeouts on machines
+    without one; the endpoints under test don't need real rows.
+    """
+    fake_engine = _FakeEngine()
+    with mock.patch("app.database.get_engine", return_value=fake_engine), \
+         mock.patch("app.main.get_engine", return_value=fake_engine):
+        yield
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _orjson_response_json():
+    """Parse response bodies with orjson for the whole suite.
+
+    With the clients session-scoped, .json() is the main residual
+    per-assertion cost; orjson is already a runtime dependency.
+    """
+    original = httpx.Response.json
+    httpx.Response.json = lambda self, **kwargs: orjson.loads(self.content)
+    yield
+    httpx.Response.json = original
+
+
+@pytest.fixture(scope="session")
+def app_instance():
+    """Import the application graph only when a test actually needs it.
+
+    A top-level ``from app.main import app`` would pull FastAPI, SQLAlchemy
+    and the settings stack into every collection pass, even for runs where
+    -k deselects this whole module.
+    """
+    from app.main import app
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app_instance):
+    """One TestClient — and one app lifespan/startup — for the whole suite.
+
+    This is also the transport-reuse story: every request in the session
+    goes through this client's single ASGI transport and anyio portal. (A
+    bare httpx.Client over ASGITransport would skip the portal but cannot
+    drive an async app from sync test code.)
+    """
+    with TestClient(app_instance) as c:
+        yield c
@@ -0,0 +1,24 @@
+import pytest
+
+# Everything here shares the session-scoped app client, so under
+# `pytest -n auto --dist=loadgroup` the whole module lands on one xdist
+# worker and the app starts once per worker instead of once per test.
+pytestmark = pytest.mark.xdist_group("fastapi_app")
+
+# A single test looping the cases beats parametrize here: one round of
+# collection, fixture resolution and reporting for the whole table. Failure
+# isolation hardly suffers — the assertion message names the failing path.
+ENDPOINT_CASES = [
+    ("/health", "status", "healthy"),
+    ("/", "message", "Welcome to"),
+]
+
+
+def test_smoke_endpoints(client):
+    """Every public endpoint responds 200 with its expected payload."""
+    for path, key, expected in ENDPOINT_CASES:
+        response = client.get(path)
+        assert response.status_code == 200, path
+        data = response.json()
+        assert key in data, path
+        assert expected in data[key], path